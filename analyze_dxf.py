@@ -1,237 +1,355 @@
 #!/usr/bin/env python3
-"""analyze_dxf.py v8.3 — Batch render + section detection (no merge)"""
+"""analyze_dxf.py v8.4 — Single-raster render, zones cropped + section detection (no merge)"""
 import sys, json, os, time
+from concurrent.futures import ThreadPoolExecutor
 
 def log(msg):
     print(msg, file=sys.stderr)
 
-def analyze(dxf_path, output_dir):
+def read_dxf_safe(dxf_path):
+    """Read a DXF, falling back to ezdxf.recover for damaged files."""
     import ezdxf
-    import matplotlib
-    matplotlib.use('Agg')
-    import matplotlib.pyplot as plt
+    from ezdxf import recover
+    try:
+        return ezdxf.readfile(dxf_path)
+    except ezdxf.DXFStructureError as err:
+        log(f"Structure error ({err}) — retrying with recover...")
+        doc, auditor = recover.readfile(dxf_path)
+        if auditor.has_errors:
+            log(f"Recovered with {len(auditor.errors)} unfixed errors")
+        return doc
+
+def analyze(dxf_path, output_dir):
     import numpy as np
-    from PIL import Image
+    from PIL import Image, ImageDraw
     Image.MAX_IMAGE_PIXELS = None  # Allow large renders (we generate these ourselves)
+    try:
+        import cv2  # Optional: C++ line rasterizer, much faster than ImageDraw on dense drawings
+    except ImportError:
+        cv2 = None
 
     start = time.time()
     os.makedirs(output_dir, exist_ok=True)
 
     log(f"Loading {os.path.basename(dxf_path)}...")
-    doc = ezdxf.readfile(dxf_path)
+    doc = read_dxf_safe(dxf_path)
     msp = doc.modelspace()
     load_time = time.time() - start
     log(f"Loaded in {load_time:.1f}s")
 
-    # ---- Count entities to detect if flattened ----
+    # ---- Batch collect ALL geometry into arrays (and count entity types in the same pass) ----
+    log("Collecting geometry...")
+    t0 = time.time()
     counts = {}
+    lines = []    # (x0, y0, x1, y1) per LINE
+    polys = []    # Nx2 vertex array per LWPOLYLINE (closed ones repeat vertex 0)
+    centers = []  # CIRCLE/ARC centers — used for bounds only
+
+    def add_line(ent):
+        d = ent.dxf
+        s, end = d.start, d.end
+        lines.append((s.x, s.y, end.x, end.y))
+
+    def add_poly(ent):
+        pts = np.asarray(ent.get_points(format='xy'), dtype=np.float64)
+        if len(pts) >= 2:
+            if ent.closed:
+                pts = np.vstack([pts, pts[:1]])
+            polys.append(pts)
+
+    def add_center(ent):
+        c = ent.dxf.center
+        centers.append((c.x, c.y))
+
+    # One dict lookup per entity instead of walking an if/elif chain
+    handlers = {'LINE': add_line, 'LWPOLYLINE': add_poly, 'CIRCLE': add_center, 'ARC': add_center}
+
     for e in msp:
         t = e.dxftype()
         counts[t] = counts.get(t, 0) + 1
+        handler = handlers.get(t)
+        if handler is not None:
+            try:
+                handler(e)
+            except:
+                pass
+
+    # ---- Detect if flattened (INSERT expansion below depends on it) ----
     total = sum(counts.values())
     line_count = counts.get('LINE', 0) + counts.get('LWPOLYLINE', 0)
     has_blocks = counts.get('INSERT', 0) > 0
     is_flattened = (line_count / max(total, 1)) > 0.90 and not has_blocks
     log(f"Entities: {total}, Flattened: {is_flattened}")
 
-    # ---- Batch collect ALL geometry into arrays ----
-    log("Collecting geometry...")
-    t0 = time.time()
-    line_xs, line_ys = [], []
-    poly_xs, poly_ys = [], []
-    pts_x, pts_y = [], []
-
-    for e in msp:
-        try:
-            if e.dxftype() == 'LINE':
-                s, end = e.dxf.start, e.dxf.end
-                line_xs.extend([s.x, end.x, None])
-                line_ys.extend([s.y, end.y, None])
-                pts_x.extend([s.x, end.x])
-                pts_y.extend([s.y, end.y])
-            elif e.dxftype() == 'LWPOLYLINE':
-                pts = list(e.get_points(format='xy'))
-                if len(pts) >= 2:
-                    for p in pts:
-                        poly_xs.append(p[0]); poly_ys.append(p[1])
-                        pts_x.append(p[0]); pts_y.append(p[1])
-                    if e.closed:
-                        poly_xs.append(pts[0][0]); poly_ys.append(pts[0][1])
-                    poly_xs.append(None); poly_ys.append(None)
-            elif e.dxftype() == 'CIRCLE':
-                c = e.dxf.center
-                pts_x.append(c.x); pts_y.append(c.y)
-            elif e.dxftype() == 'ARC':
-                c = e.dxf.center
-                pts_x.append(c.x); pts_y.append(c.y)
-            elif e.dxftype() == 'INSERT' and not is_flattened:
-                try:
-                    for ve in e.virtual_entities():
-                        if ve.dxftype() in ('TEXT', 'MTEXT'):
-                            continue
-                        if ve.dxftype() == 'LINE':
-                            s, end = ve.dxf.start, ve.dxf.end
-                            line_xs.extend([s.x, end.x, None])
-                            line_ys.extend([s.y, end.y, None])
-                            pts_x.extend([s.x, end.x])
-                            pts_y.extend([s.y, end.y])
-                        elif ve.dxftype() == 'LWPOLYLINE':
-                            vpts = list(ve.get_points(format='xy'))
-                            if len(vpts) >= 2:
-                                for p in vpts:
-                                    poly_xs.append(p[0]); poly_ys.append(p[1])
-                                    pts_x.append(p[0]); pts_y.append(p[1])
-                                if ve.closed:
-                                    poly_xs.append(vpts[0][0]); poly_ys.append(vpts[0][1])
-                                poly_xs.append(None); poly_ys.append(None)
-                except:
-                    pass
-        except:
-            pass
+    # Block references: only expand when the drawing is not flattened.
+    # Each block definition is read once; every INSERT then just maps the
+    # cached block-space points through its own transform matrix.
+    block_lines = []   # (N, 4) arrays of placed block LINEs
+    if not is_flattened:
+        block_cache = {}  # block name -> (LINE endpoints Nx2x3, [LWPOLYLINE vertices Mx3])
+
+        def block_geometry(name):
+            geom = block_cache.get(name)
+            if geom is None:
+                blines, bpolys = [], []
+                for be in doc.blocks[name]:
+                    bt = be.dxftype()
+                    if bt == 'LINE':
+                        d = be.dxf
+                        blines.append((d.start, d.end))
+                    elif bt == 'LWPOLYLINE':
+                        pts = list(be.vertices_in_wcs())
+                        if len(pts) >= 2:
+                            if be.closed:
+                                pts.append(pts[0])
+                            bpolys.append(np.array(pts, dtype=np.float64))
+                geom = block_cache[name] = (np.array(blines, dtype=np.float64).reshape(-1, 2, 3), bpolys)
+            return geom
+
+        for e in msp.query('INSERT'):
+            try:
+                blines, bpolys = block_geometry(e.dxf.name)
+                # MINSERT arrays: multi_insert() yields one plain INSERT per row/column copy
+                for ins in (e.multi_insert() if e.mcount > 1 else (e,)):
+                    m = np.array(list(ins.matrix44().rows()))
+                    rot, shift = m[:3, :2], m[3, :2]
+                    if len(blines):
+                        block_lines.append((blines @ rot + shift).reshape(-1, 4))
+                    for p in bpolys:
+                        polys.append(p @ rot + shift)
+            except:
+                pass
+
+    line_arr = np.concatenate([np.array(lines, dtype=np.float64).reshape(-1, 4)] + block_lines)
+    ctr_arr = np.array(centers, dtype=np.float64).reshape(-1, 2)
+    n_pts = 2 * len(line_arr) + sum(len(p) for p in polys) + len(ctr_arr)
 
     collect_time = time.time() - t0
-    log(f"Collected {len(pts_x)} points in {collect_time:.1f}s")
+    log(f"Collected {n_pts} points in {collect_time:.1f}s")
 
-    if len(pts_x) < 10:
+    if n_pts < 10:
         print(json.dumps({'success': False, 'error': 'No geometry found'}))
         return
 
+    # Store coordinates as float32 relative to a drawing-local origin: half the bytes
+    # for every pass below, and float32's ~7 digits then cover the drawing extent
+    # instead of raw survey-grid coordinates (which can be ~1e8 in mm).
+    ref = line_arr[:, 0:2] if len(line_arr) else np.vstack([np.concatenate(polys or [ctr_arr]), ctr_arr])
+    ox, oy = (float(v) for v in np.median(ref[::max(1, len(ref) // 1000)], axis=0))
+    segments = (line_arr - [ox, oy, ox, oy]).astype(np.float32).reshape(-1, 2, 2)
+    polys = [(p - [ox, oy]).astype(np.float32) for p in polys]
+    poly_arr = np.concatenate(polys) if polys else np.empty((0, 2), dtype=np.float32)
+    ctr_arr = (ctr_arr - [ox, oy]).astype(np.float32)
+    ax_arr = np.concatenate([segments[:, 0, 0], segments[:, 1, 0], poly_arr[:, 0], ctr_arr[:, 0]])
+    ay_arr = np.concatenate([segments[:, 0, 1], segments[:, 1, 1], poly_arr[:, 1], ctr_arr[:, 1]])
+
     # ---- Calculate bounds (percentile to exclude outliers) ----
-    ax_arr = np.array(pts_x, dtype=np.float64)
-    ay_arr = np.array(pts_y, dtype=np.float64)
-    xmin, xmax = float(np.percentile(ax_arr, 1)), float(np.percentile(ax_arr, 99))
-    ymin, ymax = float(np.percentile(ay_arr, 1)), float(np.percentile(ay_arr, 99))
-    pad = max(xmax - xmin, ymax - ymin) * 0.02
+    def robust_range(arr, lo=0.01, hi=0.99, max_samples=200_000):
+        """Nearest-rank lo/hi percentiles via one partition of an evenly strided sample."""
+        # ~200K samples pin the 1st/99th percentile far tighter than the 2% pad below
+        sample = arr[::max(1, len(arr) // max_samples)].copy()
+        k = [int(lo * (len(sample) - 1)), int(hi * (len(sample) - 1))]
+        sample.partition(k)
+        return sample[k[0]], sample[k[1]]
+
+    xmin, xmax = (float(v) + ox for v in robust_range(ax_arr))
+    ymin, ymax = (float(v) + oy for v in robust_range(ay_arr))
+    # All points coincident (e.g. concentric circles): pad by one unit so every
+    # render scale below divides by a non-zero extent
+    pad = max(xmax - xmin, ymax - ymin) * 0.02 or 1.0
     xmin -= pad; xmax += pad; ymin -= pad; ymax += pad
     width = xmax - xmin
     height = ymax - ymin
     aspect = width / max(height, 1)
     log(f"Bounds: X[{xmin:.1f}, {xmax:.1f}] Y[{ymin:.1f}, {ymax:.1f}] Aspect: {aspect:.1f}:1")
 
-    def batch_render(ax_obj, lw=0.25):
-        """Draw all collected geometry onto a matplotlib axes."""
-        if line_xs:
-            ax_obj.plot(line_xs, line_ys, color='black', linewidth=lw, solid_capstyle='round')
-        if poly_xs:
-            ax_obj.plot(poly_xs, poly_ys, color='black', linewidth=lw, solid_capstyle='round')
-
-    def save_image(fig_obj, path, max_px=5000, dpi=300):
-        """Save figure and resize if too large for Claude API."""
-        fig_obj.savefig(path, dpi=dpi, bbox_inches='tight', facecolor='white', pad_inches=0.2)
-        plt.close(fig_obj)
-        img = Image.open(path)
+    # Every render draws inside these bounds: drop zero-length lines and anything
+    # whose bbox lies wholly outside them before it reaches the rasterizer
+    bx0, bx1, by0, by1 = xmin - ox, xmax - ox, ymin - oy, ymax - oy
+    n_before = len(segments) + len(polys)
+    sx, sy = segments[:, :, 0], segments[:, :, 1]
+    keep = ((sx.max(axis=1) >= bx0) & (sx.min(axis=1) <= bx1) &
+            (sy.max(axis=1) >= by0) & (sy.min(axis=1) <= by1) &
+            ((sx[:, 0] != sx[:, 1]) | (sy[:, 0] != sy[:, 1])))
+    segments = segments[keep]
+    if polys:
+        starts = np.cumsum([0] + [len(p) for p in polys[:-1]])
+        pmin = np.minimum.reduceat(poly_arr, starts)
+        pmax = np.maximum.reduceat(poly_arr, starts)
+        keep = ((pmax[:, 0] >= bx0) & (pmin[:, 0] <= bx1) &
+                (pmax[:, 1] >= by0) & (pmin[:, 1] <= by1))
+        polys = [p for p, k in zip(polys, keep.tolist()) if k]
+    culled = n_before - len(segments) - len(polys)
+    if culled:
+        log(f"Culled {culled} degenerate/off-canvas lines")
+
+    def rasterize(x0, x1, y0, y1, scale):
+        """Draw all collected geometry inside world window [x0,x1]x[y0,y1] as 1px black lines."""
+        px_w = max(1, int(round((x1 - x0) * scale)))
+        px_h = max(1, int(round((y1 - y0) * scale)))
+        # World -> pixel for every point at once (image y grows downward)
+        offset = np.array([x0 - ox, y1 - oy], dtype=np.float32)
+        flip = np.array([scale, -scale], dtype=np.float32)
+
+        def to_pixels(pts, rint=False):
+            buf = np.subtract(pts, offset)  # the only full-size temporary; the rest runs in place
+            buf *= flip
+            return np.rint(buf, out=buf).astype(np.int32) if rint else buf
+
+        if cv2 is not None:
+            canvas = np.full((px_h, px_w), 255, dtype=np.uint8)
+            if len(segments):
+                cv2.polylines(canvas, to_pixels(segments, rint=True), False, 0, 1, cv2.LINE_8)
+            if polys:
+                cv2.polylines(canvas, [to_pixels(p, rint=True) for p in polys], False, 0, 1, cv2.LINE_8)
+            return Image.fromarray(canvas)
+        img = Image.new('L', (px_w, px_h), 255)
+        draw = ImageDraw.Draw(img)
+        for seg in to_pixels(segments).reshape(-1, 4).tolist():
+            draw.line(seg, fill=0)
+        for p in polys:
+            draw.line(to_pixels(p).ravel().tolist(), fill=0)
+        return img
+
+    def crop_zones(boxes, scale, max_pixels=150_000_000):
+        """Rasterize the whole drawing once and cut each (x0, x1, y0, y1) world box out of it."""
+        scale = min(scale, np.sqrt(max_pixels / (width * height)))
+        master = rasterize(xmin, xmax, ymin, ymax, scale)
+        log(f"  Master raster {master.width}x{master.height}")
+        wb = np.array(boxes, dtype=np.float64).reshape(-1, 4)
+        lr = np.rint((wb[:, 0:2] - xmin) * scale).astype(int)
+        tb = np.rint((ymax - wb[:, [3, 2]]) * scale).astype(int)  # world y1 is the top row
+        np.clip(lr, 0, master.width, out=lr)
+        np.clip(tb, 0, master.height, out=tb)
+        return [master.crop((l, t, r, b)) for (l, r), (t, b) in zip(lr.tolist(), tb.tolist())]
+
+    def save_image(img, path, max_px=5000):
+        """Save rendered image and resize if too large for Claude API."""
         w, h = img.size
         if w > max_px or h > max_px:
             ratio = min(max_px / w, max_px / h)
             new_w, new_h = int(w * ratio), int(h * ratio)
-            img = img.resize((new_w, new_h), Image.LANCZOS)
-            img.save(path, quality=95)
+            # Cheap integer box-reduce first, bicubic only for the fractional rest
+            # (4-tap bicubic is indistinguishable from Lanczos on line art)
+            factor = max(w, h) // max_px
+            if factor > 1:
+                img = img.reduce(factor)
+            img = img.resize((new_w, new_h), Image.BICUBIC)
             log(f"  Resized {w}x{h} -> {new_w}x{new_h}")
+        img.save(path, compress_level=1)  # zlib level 1: ~4x faster than default on dense zones
         return w, h
 
-    # ---- Render overview ----
+    # ---- Render overview (on a worker thread, overlapped with the zone work below) ----
     log("Rendering overview...")
-    t0 = time.time()
-    fig_h = 12  # taller for better quality
-    fig_w = min(fig_h * aspect, 120)
-    fig, ax = plt.subplots(1, 1, figsize=(max(fig_w, 6), fig_h))
-    ax.set_facecolor('white'); ax.set_aspect('equal'); ax.axis('off')
-    ax.set_xlim(xmin, xmax); ax.set_ylim(ymin, ymax)
-    batch_render(ax, lw=0.2)  # slightly thinner for overview
+    ov_scale = min(2400 / height, 6000 / width)  # ~2400px tall, at most 6000px wide
     overview_path = os.path.join(output_dir, 'overview.png')
-    save_image(fig, overview_path, max_px=6000, dpi=250)
-    render_time = time.time() - t0
-    log(f"Overview: {os.path.getsize(overview_path)//1024}KB in {render_time:.1f}s")
-
-    # ---- Split into zones ----
-    zones = []
-
-    if aspect > 5:
-        # ============================================
-        # WIDE MULTI-SHEET LAYOUT — SECTION DETECTION
-        # ============================================
-        log(f"Wide layout ({aspect:.0f}:1) — detecting sections by X gaps...")
-
-        # Histogram of X coords to find gaps between plan sheets
-        filtered = ax_arr[(ax_arr >= xmin) & (ax_arr <= xmax)]
-        hist, edges = np.histogram(filtered, bins=300)
-        threshold = max(hist) * 0.01
-        gap_indices = np.where(hist < threshold)[0]
 
-        sections = []
-        sec_start = xmin
-        min_w = width * 0.03  # minimum 3% of total width
-
-        for idx in gap_indices:
-            gap_x = float((edges[idx] + edges[idx + 1]) / 2)
-            if gap_x - sec_start > min_w:
+    def render_overview():
+        t = time.time()
+        save_image(rasterize(xmin, xmax, ymin, ymax, ov_scale), overview_path, max_px=6000)
+        return time.time() - t
+
+    # cv2 drawing, numpy and zlib release the GIL, so the renders and PNG encodes really overlap
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 2) as pool:
+        overview_job = pool.submit(render_overview)
+
+        # ---- Split into zones ----
+        zones = []
+
+        if aspect > 5:
+            # ============================================
+            # WIDE MULTI-SHEET LAYOUT — SECTION DETECTION
+            # ============================================
+            log(f"Wide layout ({aspect:.0f}:1) — detecting sections by X gaps...")
+
+            # Histogram of X coords to find gaps between plan sheets
+            filtered = ax_arr[(ax_arr >= xmin - ox) & (ax_arr <= xmax - ox)]
+            # Uniform bins over the data extent: direct bin index + bincount
+            nb = 300
+            lo, hi = filtered.min(), filtered.max()
+            idx = ((filtered - lo) * (nb / (hi - lo))).astype(np.intp)
+            np.minimum(idx, nb - 1, out=idx)  # x == hi belongs to the last bin
+            hist = np.bincount(idx, minlength=nb)
+            edges = np.linspace(float(lo) + ox, float(hi) + ox, nb + 1)
+            threshold = max(hist) * 0.01
+            gap_indices = np.where(hist < threshold)[0]
+
+            sections = []
+            sec_start = xmin
+            min_w = width * 0.03  # minimum 3% of total width
+
+            # Next split = first gap center more than min_w past the current start;
+            # searchsorted jumps straight to it, so this loops once per section
+            gap_centers = (edges[gap_indices] + edges[gap_indices + 1]) / 2
+            i = np.searchsorted(gap_centers, sec_start + min_w, side='right')
+            while i < len(gap_centers):
+                gap_x = float(gap_centers[i])
                 sections.append((sec_start, gap_x))
                 sec_start = gap_x
-        if xmax - sec_start > min_w:
-            sections.append((sec_start, xmax))
-
-        # NO MERGING — use raw sections as-is (merging was causing all sections to become 1)
-        log(f"Found {len(sections)} sections")
-
-        for i, (sx0, sx1) in enumerate(sections):
-            sw = sx1 - sx0
-            sa = sw / max(height, 1)
-            sf_h = 15
-            sf_w = max(min(sf_h * sa, 40), 4)  # between 4 and 40 inches to prevent huge images
-
-            fig, ax = plt.subplots(1, 1, figsize=(sf_w, sf_h))
-            ax.set_facecolor('white'); ax.set_aspect('equal'); ax.axis('off')
-            ax.set_xlim(sx0, sx1); ax.set_ylim(ymin, ymax)
-
-            # Use thicker lines so they're visible in compressed images
-            lw = 0.3  # was 0.2
-            if line_xs:
-                ax.plot(line_xs, line_ys, color='black', linewidth=lw, solid_capstyle='round')
-            if poly_xs:
-                ax.plot(poly_xs, poly_ys, color='black', linewidth=lw, solid_capstyle='round')
-
-            zpath = os.path.join(output_dir, f'zone_{i}.png')
-            img_w, img_h = save_image(fig, zpath, max_px=5000, dpi=200)  # 200 DPI to avoid huge images
-
-            size_kb = os.path.getsize(zpath) // 1024
-            zones.append({
-                'zone_id': i,
-                'image_path': zpath,
-                'bounds': {'x_min': sx0, 'x_max': sx1, 'y_min': ymin, 'y_max': ymax},
-                'size_kb': size_kb,
-                'dimensions': [img_w, img_h]
-            })
-
-            # Warn if section is suspiciously small (probably blank)
-            if size_kb < 50:
-                log(f"  ⚠️ Section {i}: X[{sx0:.0f}-{sx1:.0f}] {img_w}x{img_h} -> {size_kb}KB — LIKELY BLANK!")
-            else:
-                log(f"  Section {i}: X[{sx0:.0f}-{sx1:.0f}] {img_w}x{img_h} -> {size_kb}KB")
-
-    else:
-        # ============================================
-        # NORMAL ASPECT — USE 3x3 GRID WITH OVERLAP
-        # ============================================
-        log("Normal aspect — using 3x3 grid...")
-
-        for row in range(3):
-            for col in range(3):
-                # 10% overlap between zones
-                zw = width / 2.7
-                zh = height / 2.7
-                zx0 = xmin + col * (width - zw) / 2
-                zy0 = ymin + row * (height - zh) / 2
-                zx1 = zx0 + zw
-                zy1 = zy0 + zh
-
-                fig, ax = plt.subplots(1, 1, figsize=(16, 16))  # was 15
-                ax.set_facecolor('white'); ax.set_aspect('equal'); ax.axis('off')
-                ax.set_xlim(zx0, zx1); ax.set_ylim(zy0, zy1)
-                batch_render(ax, lw=0.3)  # thicker lines
-
-                zone_idx = row * 3 + col
-                zpath = os.path.join(output_dir, f'zone_{zone_idx}.png')
-                img_w, img_h = save_image(fig, zpath, max_px=5000, dpi=300)
+                i = np.searchsorted(gap_centers, sec_start + min_w, side='right')
+            if xmax - sec_start > min_w:
+                sections.append((sec_start, xmax))
+
+            # NO MERGING — use raw sections as-is (merging was causing all sections to become 1)
+            log(f"Found {len(sections)} sections")
+
+            # Every section ~2300px tall. One wider than 5000px is drawn on its own at
+            # the smaller scale instead: shrinking 1px aliased lines fades them to gray.
+            sec_scale = 2300 / height
+            fits = [(sx1 - sx0) * sec_scale <= 5000 for sx0, sx1 in sections]
+            cut = iter(crop_zones([(sx0, sx1, ymin, ymax) for (sx0, sx1), f in zip(sections, fits) if f], sec_scale)
+                       if any(fits) else [])
+            crops = [next(cut) if f else rasterize(sx0, sx1, ymin, ymax, 5000 / (sx1 - sx0))
+                     for (sx0, sx1), f in zip(sections, fits)]
+
+            # Ink is measured before the crops are handed to the encoder threads
+            inks = [sum(img.histogram()[:128]) / (img.width * img.height) for img in crops]
+            paths = [os.path.join(output_dir, f'zone_{i}.png') for i in range(len(crops))]
+            saves = [pool.submit(save_image, img, zpath, 5000) for img, zpath in zip(crops, paths)]
+
+            for i, ((sx0, sx1), ink, zpath, job) in enumerate(zip(sections, inks, paths, saves)):
+                img_w, img_h = job.result()
+
+                size_kb = os.path.getsize(zpath) // 1024
+                zones.append({
+                    'zone_id': i,
+                    'image_path': zpath,
+                    'bounds': {'x_min': sx0, 'x_max': sx1, 'y_min': ymin, 'y_max': ymax},
+                    'size_kb': size_kb,
+                    'dimensions': [img_w, img_h]
+                })
+
+                # Warn if section has almost no ink (probably blank)
+                if ink < 0.0005:
+                    log(f"  ⚠️ Section {i}: X[{sx0:.0f}-{sx1:.0f}] {img_w}x{img_h} -> {size_kb}KB — LIKELY BLANK!")
+                else:
+                    log(f"  Section {i}: X[{sx0:.0f}-{sx1:.0f}] {img_w}x{img_h} -> {size_kb}KB")
+
+        else:
+            # ============================================
+            # NORMAL ASPECT — USE 3x3 GRID WITH OVERLAP
+            # ============================================
+            # Zone canvas follows drawing complexity: sparse plans don't need 3800px zones
+            zone_px = int(min(max(np.sqrt(len(segments) + len(polys)) * 160, 2400), 3800))
+            log(f"Normal aspect — using 3x3 grid ({zone_px}px zones)...")
+
+            boxes = []
+            for row in range(3):
+                for col in range(3):
+                    # 10% overlap between zones
+                    zw = width / 2.7
+                    zh = height / 2.7
+                    zx0 = xmin + col * (width - zw) / 2
+                    zy0 = ymin + row * (height - zh) / 2
+                    boxes.append((zx0, zx0 + zw, zy0, zy0 + zh))
+
+            crops = crop_zones(boxes, zone_px / max(zw, zh))
+
+            paths = [os.path.join(output_dir, f'zone_{i}.png') for i in range(len(crops))]
+            saves = [pool.submit(save_image, img, zpath, 5000) for img, zpath in zip(crops, paths)]
+
+            for zone_idx, ((zx0, zx1, zy0, zy1), zpath, job) in enumerate(zip(boxes, paths, saves)):
+                img_w, img_h = job.result()
 
                 size_kb = os.path.getsize(zpath) // 1024
                 zones.append({
@@ -243,13 +361,16 @@ def analyze(dxf_path, output_dir):
                 })
                 log(f"  Zone {zone_idx}: {size_kb}KB")
 
+        render_time = overview_job.result()
+    log(f"Overview: {os.path.getsize(overview_path)//1024}KB in {render_time:.1f}s")
+
     total_time = time.time() - start
     log(f"Done in {total_time:.1f}s — {len(zones)} zones")
 
     # ---- OUTPUT (only JSON on stdout) ----
     result = {
         'success': True,
-        'version': 'analyze_dxf v8.3',
+        'version': 'analyze_dxf v8.4',
         'is_flattened': is_flattened,
         'total_entities': total,
         'entity_counts': counts,
@@ -10,7 +10,7 @@
  * HIGH-RES VISION: Puppeteer captures 4096x4096 screenshot from APS Viewer
  * Splits into 9 zones + full image -> Claude Vision analysis
  * DWG: APS upload -> SVF2 -> Puppeteer screenshot -> Vision
- * DXF: Python ezdxf + matplotlib for high-quality rendering
+ * DXF: Python ezdxf + OpenCV/Pillow for high-quality rendering
  *
  * v40.0: FLATTENED DXF SUPPORT
  *   - Batch rendering for 1M+ entities
@@ -1253,7 +1253,7 @@ async function renderDXFWithPython(dxfPath, outputDir) {
   } catch (e) {
     console.log('⚠️ ezdxf not installed. Attempting pip install...');
     try {
-      execSync(`${pythonCmd} -m pip install ezdxf matplotlib Pillow numpy --user --quiet 2>&1 || ${pythonCmd} -m pip install ezdxf matplotlib Pillow numpy --break-system-packages --quiet 2>&1`, {
+      execSync(`${pythonCmd} -m pip install ezdxf Pillow numpy opencv-python-headless --user --quiet 2>&1 || ${pythonCmd} -m pip install ezdxf Pillow numpy opencv-python-headless --break-system-packages --quiet 2>&1`, {
         stdio: 'pipe',
         timeout: 180000,
         encoding: 'utf8'
@@ -4459,7 +4459,7 @@ const server = app.listen(PORT, '0.0.0.0', () => {
   console.log('========================================');
   console.log('🔥 Fire Safety Mode: DWG → APS Vision Analysis');
   console.log('📋 Compliance Mode: Reference Docs → Requirements → Plan Check');
-  console.log('🐍 DXF Support: Python ezdxf + matplotlib (high quality)');
+  console.log('🐍 DXF Support: Python ezdxf + OpenCV/Pillow (high quality)');
   console.log('📐 Flattened DXF: Batch render + Section detection + 20-check analysis');
   console.log('========================================\n');
 });